@@ -0,0 +1,210 @@
+"""
+Mocked Supermetrics REST payloads used by unit tests
+"""
+import json
+
+# Token registration
+TOKEN = {
+    'meta': {
+        'request_id': '3wNkT6QwgwQ4Zx8tJtfLjSdiZtxBBDDN'
+    },
+    'data': {
+        'client_id': 'ju16a6m81mhid5ue1z3v2g0uh',
+        'email': 'manish@gmail.com',
+        'sl_token': 'smslt_fc7ae7837d8ca_e1e890bd06bfea'
+    }
+}
+
+# Token which will be treated as expired/invalid
+INVALID_TOKEN = {
+    'meta': {
+        'request_id': '3wNkT6QwgwQ4Zx8tJtfLjSdiZtxBBDDN'
+    },
+    'data': {
+        'client_id': 'ju16a6m81mhid5ue1z3v2g0uh',
+        'email': 'manish@gmail.com',
+        'sl_token': 'invalid'
+    }
+}
+
+# Pages of user posts
+PAGES = {
+    1: {
+        'meta': {
+            'request_id': 'k2mBgHZCTGTQfDSGfrmOjPsWXLbjstT5'
+        },
+        'data': {
+            'page': 1,
+            'posts': [
+                {
+                    'id': 'post616bdd1725be9_16fba4ff',
+                    'from_name': 'Britany Heise',
+                    'from_id': 'user_4',
+                    'message': 'test message 123',
+                    'type': 'status',
+                    'created_time': '2021-10-17T02:36:47+00:00'
+                },
+                {
+                    'id': 'post616bdd1725c7d_d7f8fc3b',
+                    'from_name': 'Carson Smithson',
+                    'from_id': 'user_5',
+                    'message': 'test msg',
+                    'type': 'status',
+                    'created_time': '2021-10-17T01:36:49+00:00'
+                },
+                {
+                    'id': 'post616bdd1725c95_70b5e836',
+                    'from_name': 'Gigi Richter',
+                    'from_id': 'user_7',
+                    'message': 'this is a test',
+                    'type': 'status',
+                    'created_time': '2021-09-05T01:10:00+00:00'
+                }
+            ]
+        }
+    },
+    2: {
+        'meta': {
+            'request_id': 'k2mBgHZCTABCDfGfrmOjPsWXLbjstT5'
+        },
+        'data': {
+            'page': 2,
+            'posts': [
+                {
+                    'id': 'post61dfds67d1725be9_16fba4ff',
+                    'from_name': 'Britany Heise',
+                    'from_id': 'user_4',
+                    'message': 'test message test message',
+                    'type': 'status',
+                    'created_time': '2021-09-25T02:36:47+00:00'
+                },
+                {
+                    'id': 'post616bdsf725c7d_d7f8fc3b',
+                    'from_name': 'Macie Mckamey',
+                    'from_id': 'user_11',
+                    'message': 'test msg abcd1234',
+                    'type': 'status',
+                    'created_time': '2021-09-25T01:36:49+00:00'
+                },
+                {
+                    'id': 'post616bddjh6695_70b5e836',
+                    'from_name': 'Regenia Boice',
+                    'from_id': 'user_13',
+                    'message': 'this is a test',
+                    'type': 'status',
+                    'created_time': '2021-08-05T05:10:00+00:00'
+                }
+            ]
+        }
+    },
+    3: {
+        'meta': {
+            'request_id': 'k2mBgHZCgdghk455OjPsWXLbjstT5'
+        },
+        'data': {
+            'page': 3,
+            'posts': [
+                {
+                    'id': 'post61dfds67d1725be9_16fba4ff',
+                    'from_name': 'Britany Heise',
+                    'from_id': 'user_4',
+                    'message': 'test message test message',
+                    'type': 'status',
+                    'created_time': '2021-08-25T02:36:47+00:00'
+                },
+                {
+                    'id': 'post616bdsf725c7d_d7f8fc3b',
+                    'from_name': 'Macie Mckamey',
+                    'from_id': 'user_11',
+                    'message': 'test msg abcd1234',
+                    'type': 'status',
+                    'created_time': '2021-08-25T01:36:49+00:00'
+                },
+                {
+                    'id': 'post616bddjh6695_70b5e836',
+                    'from_name': 'Carson Smithson',
+                    'from_id': 'user_5',
+                    'message': 'this is a test',
+                    'type': 'status',
+                    'created_time': '2021-08-05T05:10:00+00:00'
+                }
+            ]
+        }
+    },
+    4: {
+        'meta': {
+            'request_id': 'k2mBgHZCgdghk455OjPsWXLbjstT5'
+        },
+        'data': {
+            'page': 4,
+            'posts': [
+                {
+                    'id': 'post61dfds67d1725be9_16fba4ff',
+                    'from_name': 'Britany Heise',
+                    'from_id': 'user_4',
+                    'message': 'test message xy',
+                    'type': 'status',
+                    'created_time': '2021-06-25T02:36:47+00:00'
+                },
+                {
+                    'id': 'post616bdsf725c7d_d7f8fc3b',
+                    'from_name': 'Britany Heise',
+                    'from_id': 'user_4',
+                    'message': 'test msg abcd',
+                    'type': 'status',
+                    'created_time': '2021-06-02T01:36:49+00:00'
+                },
+                {
+                    'id': 'post616bddjh6695_70b5e836',
+                    'from_name': 'Britany Heise',
+                    'from_id': 'user_4',
+                    'message': 'test',
+                    'type': 'status',
+                    'created_time': '2021-06-01T05:10:00+00:00'
+                },
+                {
+                    'id': 'post616bddjh6695_70b5e836',
+                    'from_name': 'Carson Smithson',
+                    'from_id': 'user_5',
+                    'message': 'this is a test',
+                    'type': 'status',
+                    'created_time': '2021-05-05T05:10:00+00:00'
+                }
+            ]
+        }
+    }
+}
+
+# Posts not found
+EMPTY_POSTS = {
+    'meta': {
+        'request_id': 'k2mBgHZCTGTQfDSGfrmOjPsWXLbjstT5'
+    },
+    'data': {
+        'page': 1,
+        'posts': []
+    }
+}
+
+# Posts requested with an invalid token
+INVALID_TOKEN_POSTS = {
+    'meta': {
+        'request_id': 'zpE8sGRIxic95VSkMMe74qSSDO8ddTiq'
+    },
+    'error': {
+        'message': 'Invalid SL Token'
+    }
+}
+
+def to_bytes(payload):
+    """
+    Serialize a payload the way it is received over HTTP
+    """
+    return json.dumps(payload).encode()
+
+# Payloads are serialized once at import
+TOKEN_BYTES = to_bytes(TOKEN)
+INVALID_TOKEN_BYTES = to_bytes(INVALID_TOKEN)
+PAGES_BYTES = {page: to_bytes(payload) for page, payload in PAGES.items()}
+EMPTY_POSTS_BYTES = to_bytes(EMPTY_POSTS)
+INVALID_TOKEN_POSTS_BYTES = to_bytes(INVALID_TOKEN_POSTS)
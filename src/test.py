@@ -2,330 +2,214 @@
 Unit test to verify Supermetrics stats package
 """
 import unittest
-import unittest.mock
 from unittest.mock import patch, ANY
+import io
 import json
-from requests import Response
+from pathlib import Path
+try:
+    # Optional faster parser for expected stats
+    from orjson import loads as load_json
+except ImportError:
+    from json import loads as load_json
 from smstats import PostManager, Config, DataGetError
+import fixtures
 
-class TestSMStats(unittest.TestCase):
+# Resources are located relative to this file, so tests run from any directory
+RESOURCES_DIR = Path(__file__).resolve().parent / 'resources'
+
+def read_resource(file_name):
     """
-    Test stats gatherer from Supermetrics stats package
+    Read raw bytes of a test resource
     """
+    return (RESOURCES_DIR / file_name).read_bytes()
 
-    @staticmethod
-    def get_valid_token(*_, **__):
-        """
-        Mock registering a token with Supermetrics
-        """
-        post_response = Response()
-        post_response.status_code = 200
-        with open('resources/token_response.json', 'rb') as resp:
-            post_response._content = resp.read() # pylint: disable=W0212
-
-        return post_response
-
-    @staticmethod
-    def get_invalid_token(*_, **__):
-        """
-        Mock getting a token from Supermetrics which will be treated as expired/invalid
-        """
-        post_response = Response()
-        post_response.status_code = 200
-        with open('resources/invalid_token_response.json', 'rb') as resp:
-            post_response._content = resp.read() # pylint: disable=W0212
+# Expected error messages
+ERR_GET_TOKEN_500 = 'Error during stage: Get Token. Unexpected reponse status: 500'
+ERR_GET_POSTS_500 = 'Error during stage: Get Posts. Unexpected reponse status: 500'
+ERR_GET_POSTS_503 = 'Error during stage: Get Posts. Unexpected reponse status: 503'
+ERR_NO_JSON = 'Error during stage: Get Posts. Could not read json from response'
+ERR_MISSING_PARAM = ('Error during stage: Get Posts.'
+                     " Parameter ('data', 'posts') not found in received json response")
 
-        return post_response
-
-    @staticmethod
-    def get_no_token_response(*_, **__):
-        """
-        Mock failed attempt to register a token with Supermetrics
-        """
-        post_response = Response()
-        post_response.status_code = 500
-        return post_response
-
-    @staticmethod
-    def get_valid_posts(*_, **kwargs):
-        """
-        Mock getting user post from Supermetrics
-        """
-        token = kwargs['params']['sl_token']
-        page = kwargs['params']['page']
-        get_response = Response()
+# Pages of user posts available as fixtures
+POST_PAGES = len(fixtures.PAGES)
 
-        if token != 'invalid':
-            get_response.status_code = 200
-            with open(f'resources/post_response_p{page}.json', 'rb') as resp:
-                get_response._content = resp.read() # pylint: disable=W0212
-        else:
-            get_response.status_code = 500
-            with open('resources/post_invalid_token.json', 'rb') as resp:
-                get_response._content = resp.read() # pylint: disable=W0212
+# Expected stats are parsed once at import
+EXPECTED_STATS = load_json(read_resource('stats.json'))
+EXPECTED_STATS_NO_POST = load_json(read_resource('stats_no_post.json'))
 
-        return get_response
-
-    @staticmethod
-    def get_empty_posts(*_, **__):
-        """
-        Mock getting user post from Supermetrics (but posts not found)
-        """
-        get_response = Response()
-        get_response.status_code = 200
-        with open('resources/post_response_empty.json', 'rb') as resp:
-            get_response._content = resp.read() # pylint: disable=W0212
-
-        return get_response
-
-    @staticmethod
-    def get_posts_error(*_, **__):
-        """
-        Mock getting error when getting user post from Supermetrics
-        """
-        get_response = Response()
-        get_response.status_code = 503
-
-        return get_response
-
-    @staticmethod
-    def get_posts_no_body(*_, **__):
-        """
-        Mock getting response with no body when getting user post from Supermetrics
-        """
-        get_response = Response()
-        get_response.status_code = 200
-        get_response._content = b'{' # pylint: disable=W0212
+class MockResponse:
+    """
+    Lightweight stand-in for requests.Response
+    Body is available as content, json, raw stream or chunks, so streaming
+    code paths can be exercised in memory
+    """
+    __slots__ = ('status_code', 'content', 'headers', 'raw')
+
+    def __init__(self, status_code, content=b''):
+        """Keep status and body"""
+        self.status_code = status_code
+        self.content = content
+        self.headers = {'Content-Length': str(len(content))}
+        self.raw = io.BytesIO(content)
+
+    def iter_content(self, chunk_size=1):
+        """Iterate over the body in chunks, whole body if chunk size is None"""
+        if chunk_size is None:
+            chunk_size = max(len(self.content), 1)
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start+chunk_size]
+
+    def json(self):
+        """Decode json body, raising JSONDecodeError like requests"""
+        return json.loads(self.content)
+
+def respond(status_code, content=b''):
+    """
+    Mock side effect building a fresh response, with its own raw stream, on every call
+    """
+    return lambda *_, **__: MockResponse(status_code, content)
 
-        return get_response
+class TestSMStats(unittest.TestCase):
+    """
+    Test stats gatherer from Supermetrics stats package
+    """
 
-    @staticmethod
-    def get_posts_param_missing(*_, **__):
+    def setUp(self):
         """
-        Mock getting response with missing expected parameters when getting user post
-        from Supermetrics
+        Fresh configuration and mocked requests for every test
         """
-        get_response = Response()
-        get_response.status_code = 200
-        get_response._content = b'{}' # pylint: disable=W0212
+        self.config = Config()
+        self.config.max_page = POST_PAGES
 
-        return get_response
+        # Mock Supermetrics REST calls
+        self.mock_post = patch('smstats.manager.requests.post').start()
+        self.mock_get = patch('smstats.manager.requests.get').start()
+        self.addCleanup(patch.stopall)
 
     @staticmethod
-    def get_posts_invalid_body(*_, **__):
+    def get_valid_posts(*_, **kwargs):
         """
-        Mock getting response with malformed json when getting user post from Supermetrics
+        Mock getting user post from Supermetrics
         """
-        get_response = Response()
-        get_response.status_code = 200
+        if kwargs['params']['sl_token'] == 'invalid':
+            return MockResponse(500, fixtures.INVALID_TOKEN_POSTS_BYTES)
 
-        return get_response
+        return MockResponse(200, fixtures.PAGES_BYTES[kwargs['params']['page']])
 
-    @patch('smstats.manager.requests.post')
-    @patch('smstats.manager.requests.get')
-    def test_gather(self, mock_get, mock_post):
+    def test_gather(self):
         """
         Test if we are able to gather and present stats
         """
         # Mock Token registration
-        mock_post.side_effect = self.get_valid_token
+        self.mock_post.side_effect = respond(200, fixtures.TOKEN_BYTES)
 
         # Mock get posts
-        mock_get.side_effect = self.get_valid_posts
+        self.mock_get.side_effect = self.get_valid_posts
 
-        config = Config()
-        config.max_page = 4
-        manager = PostManager(config)
+        manager = PostManager(self.config)
         stats = manager.get_posts_stats()
-        with open('resources/stats.json', 'r') as stat_file:
-            expected_stats = json.load(stat_file)
-        self.assertEqual(stats, expected_stats)
+        self.assertEqual(stats, EXPECTED_STATS)
 
-    @patch('smstats.manager.requests.post')
-    def test_custom_config(self, mock_post):
+    def test_custom_config(self):
         """
         Test if custom parameters are being used to register token
         """
         # Mock Token registration
-        mock_post.side_effect = self.get_valid_token
-
-        config = Config()
-        config.client_id = 'demo_cl'
-        config.name = 'abc'
-        config.email = 'abc@gmail.com'
-        config.max_page = 4
-        PostManager(config)
+        self.mock_post.side_effect = respond(200, fixtures.TOKEN_BYTES)
+
+        self.config.client_id = 'demo_cl'
+        self.config.name = 'abc'
+        self.config.email = 'abc@gmail.com'
+        PostManager(self.config)
         expected_body = {'client_id': 'demo_cl',
                          'email': 'abc@gmail.com',
                          'name': 'abc'}
-        mock_post.assert_called_with(url=ANY, json=expected_body)
+        self.mock_post.assert_called_with(url=ANY, json=expected_body)
 
-    @patch('smstats.manager.requests.post')
-    @patch('smstats.manager.requests.get')
-    def test_gather_no_posts(self, mock_get, mock_post):
+    def test_gather_no_posts(self):
         """
         Test if we are able to present stats even when no post are found
         """
         # Mock Token registration
-        mock_post.side_effect = self.get_valid_token
+        self.mock_post.side_effect = respond(200, fixtures.TOKEN_BYTES)
 
         # Mock get posts
-        mock_get.side_effect = self.get_empty_posts
+        self.mock_get.side_effect = respond(200, fixtures.EMPTY_POSTS_BYTES)
 
-        config = Config()
-        config.max_page = 4
-        manager = PostManager(config)
+        manager = PostManager(self.config)
         stats = manager.get_posts_stats()
-        with open('resources/stats_no_post.json', 'r') as stat_file:
-            expected_stats = json.load(stat_file)
-        self.assertEqual(stats, expected_stats)
+        self.assertEqual(stats, EXPECTED_STATS_NO_POST)
 
-    @patch('smstats.manager.requests.post')
-    def test_token_reg_failed(self, mock_post):
+    def test_token_reg_failed(self):
         """
         Test if we throw the right exception when token registration failed
         """
         # Mock Token registration
-        mock_post.side_effect = self.get_no_token_response
+        self.mock_post.side_effect = respond(500)
 
         with self.assertRaises(DataGetError) as err_cntx:
             PostManager()
 
-        self.assertEqual('Error during stage: Get Token. Unexpected reponse status: 500',
-                         str(err_cntx.exception))
+        self.assertEqual(ERR_GET_TOKEN_500, str(err_cntx.exception))
 
-    @patch('smstats.manager.requests.post')
-    @patch('smstats.manager.requests.get')
-    def test_token_expired(self, mock_get, mock_post):
+    def test_token_expired(self):
         """
         Test if an expired token is refreshed with getting posts
         """
         # Mock Token registration
-        mock_post.side_effect = [self.get_invalid_token(), self.get_valid_token()]
+        self.mock_post.side_effect = iter([MockResponse(200, fixtures.INVALID_TOKEN_BYTES),
+                                           MockResponse(200, fixtures.TOKEN_BYTES)])
 
         # Mock get posts
-        mock_get.side_effect = self.get_valid_posts
+        self.mock_get.side_effect = self.get_valid_posts
 
-        config = Config()
-        config.max_page = 4
-        manager = PostManager(config)
+        manager = PostManager(self.config)
         stats = manager.get_posts_stats()
-        with open('resources/stats.json', 'r') as stat_file:
-            expected_stats = json.load(stat_file)
-        self.assertEqual(stats, expected_stats)
+        self.assertEqual(stats, EXPECTED_STATS)
 
-    @patch('smstats.manager.requests.post')
-    @patch('smstats.manager.requests.get')
-    def test_token_invalid(self, mock_get, mock_post):
+    def test_token_invalid(self):
         """
         Test exception when a token is reported as invalid even after it is refreshed
         """
         # Mock Token registration
-        mock_post.side_effect = self.get_invalid_token
+        self.mock_post.side_effect = respond(200, fixtures.INVALID_TOKEN_BYTES)
 
         # Mock get posts
-        mock_get.side_effect = self.get_valid_posts
+        self.mock_get.side_effect = self.get_valid_posts
 
-        config = Config()
-        config.max_page = 4
-        manager = PostManager(config)
+        manager = PostManager(self.config)
 
         with self.assertRaises(DataGetError) as err_cntx:
             manager.get_posts_stats()
 
-        self.assertEqual('Error during stage: Get Posts. Unexpected reponse status: 500',
-                         str(err_cntx.exception))
+        self.assertEqual(ERR_GET_POSTS_500, str(err_cntx.exception))
 
-    @patch('smstats.manager.requests.post')
-    @patch('smstats.manager.requests.get')
-    def test_post_error(self, mock_get, mock_post):
+    def test_post_error_paths(self):
         """
-        Test exception when a request to get post received an error response
+        Test exception when a request to get post received an error response,
+        a response with missing body, malformed json or missing expected parameter
         """
         # Mock Token registration
-        mock_post.side_effect = self.get_valid_token
+        self.mock_post.side_effect = respond(200, fixtures.TOKEN_BYTES)
 
-        # Mock get posts
-        mock_get.side_effect = self.get_posts_error
-
-        config = Config()
-        config.max_page = 4
-        manager = PostManager(config)
-
-        with self.assertRaises(DataGetError) as err_cntx:
-            manager.get_posts_stats()
+        # Token is registered once, each case only swaps the get posts response
+        manager = PostManager(self.config)
 
-        self.assertEqual('Error during stage: Get Posts. Unexpected reponse status: 503',
-                         str(err_cntx.exception))
-
-    @patch('smstats.manager.requests.post')
-    @patch('smstats.manager.requests.get')
-    def test_post_no_body(self, mock_get, mock_post):
-        """
-        Test exception when a request to get post received a response with missing body
-        """
-        # Mock Token registration
-        mock_post.side_effect = self.get_valid_token
-
-        # Mock get posts
-        mock_get.side_effect = self.get_posts_no_body
-
-        config = Config()
-        config.max_page = 4
-        manager = PostManager(config)
-
-        with self.assertRaises(DataGetError) as err_cntx:
-            manager.get_posts_stats()
+        cases = [('error response', respond(503), ERR_GET_POSTS_503),
+                 ('missing body', respond(200, b'{'), ERR_NO_JSON),
+                 ('malformed json', respond(200), ERR_NO_JSON),
+                 ('missing parameter', respond(200, b'{}'), ERR_MISSING_PARAM)]
 
-        self.assertEqual('Error during stage: Get Posts. Could not read json from response',
-                         str(err_cntx.exception))
+        for case, response, message in cases:
+            with self.subTest(case=case):
+                # Mock get posts
+                self.mock_get.side_effect = response
 
-    @patch('smstats.manager.requests.post')
-    @patch('smstats.manager.requests.get')
-    def test_post_malformed(self, mock_get, mock_post):
-        """
-        Test exception when a request to get post received a response with malformed json
-        """
-        # Mock Token registration
-        mock_post.side_effect = self.get_valid_token
-
-        # Mock get posts
-        mock_get.side_effect = self.get_posts_invalid_body
-
-        config = Config()
-        config.max_page = 4
-        manager = PostManager(config)
-
-        with self.assertRaises(DataGetError) as err_cntx:
-            manager.get_posts_stats()
-
-        self.assertEqual('Error during stage: Get Posts. Could not read json from response',
-                         str(err_cntx.exception))
-
-    @patch('smstats.manager.requests.post')
-    @patch('smstats.manager.requests.get')
-    def test_post_missing_param(self, mock_get, mock_post):
-        """
-        Test exception when a request to get post received a
-        response with missing expected parameter
-        """
-        # Mock Token registration
-        mock_post.side_effect = self.get_valid_token
-
-        # Mock get posts
-        mock_get.side_effect = self.get_posts_param_missing
-
-        config = Config()
-        config.max_page = 4
-        manager = PostManager(config)
-
-        with self.assertRaises(DataGetError) as err_cntx:
-            manager.get_posts_stats()
+                with self.assertRaises(DataGetError) as err_cntx:
+                    manager.get_posts_stats()
 
-        self.assertEqual(\
-        ('Error during stage: Get Posts.'
-        " Parameter ('data', 'posts') not found in received json response"),
-        str(err_cntx.exception))
+                self.assertEqual(message, str(err_cntx.exception))
 
 if __name__ == '__main__':
     unittest.main()